@@ -3,31 +3,119 @@ import cohere
 import numpy as np
 import re
 import logging
-from typing import Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Dict, Iterator, List, Optional
 from google_vision import GoogleVisionService
+from stage_executor import StageExecutor, timed
+from lexical_filter import LexicalTriage
+from reference_parser import parse_references
 from config import Config
 from googleapiclient.discovery import build
 class AIService:
-    def __init__(self, api_key: str):
-        """Initialize AI services with Cohere and Google Vision"""
+    def __init__(self, api_key: str, client=None, vision_service=None):
+        """Initialize AI services with Cohere and Google Vision
+
+        ``client`` and ``vision_service`` replace the real backends, e.g. with
+        the fakes used by loadtest.py.
+        """
         try:
-            self.co = cohere.Client(api_key)
-            self.vision_service = GoogleVisionService()
+            self.co = client or cohere.Client(api_key)
+            self.vision_service = vision_service or GoogleVisionService()
+            self.executor = StageExecutor(Config.STAGE_WORKERS)
+            self.triage = LexicalTriage()
         except Exception as e:
             logging.error(f"AI Service initialization failed: {e}")
             raise
 
-    def analyze_content(self, text: str) -> Dict:
+    def analyze_content(self, text: str, deadline: Optional[float] = None) -> Dict:
             """Main text analysis pipeline with scoring"""
-            analysis = {
-                'direct_quotes': self._find_direct_quotes(text),
-                'paraphrased': self._find_paraphrased_content(text),
-                'references': self._analyze_reference_section(text),
-                'plagiarism_score': 0.0  # Initialize score
-            }
-            analysis['plagiarism_score'] = self._calculate_plagiarism_score(analysis)
+            analysis = {}
+            for analysis in self.analyze_content_stream(text, deadline):
+                pass
             return analysis
 
+    def analyze_content_stream(self, text: str, deadline: Optional[float] = None) -> Iterator[Dict]:
+        """Yield a provisional analysis each time a stage or paraphrase chunk finishes.
+
+        Reference validation is local and linear-time, so it runs first and
+        is never cut short. Quote search and every paraphrase chunk then run
+        concurrently, so total latency follows the slowest stage rather than
+        their sum. Once ``deadline`` seconds (default Config.ANALYSIS_DEADLINE)
+        have passed, unfinished stages are marked truncated and the best
+        partial analysis is returned. The last analysis yielded has
+        ``complete`` set to True.
+        """
+        budget = Config.ANALYSIS_DEADLINE if deadline is None else deadline
+        start = time.perf_counter()
+        chunks = self._chunk_text(text)
+        triage = self.triage.select(chunks)
+        chunks = [chunks[i] for i in triage['selected']]
+        tasks = {'direct_quotes': partial(self._find_direct_quotes, text)}
+        for i, chunk in enumerate(chunks):
+            tasks[f'paraphrased:{i}'] = partial(self._paraphrase_chunk, chunk)
+
+        references, reference_seconds = timed(partial(self._analyze_reference_section, text))
+        analysis = {
+            'direct_quotes': [],
+            'paraphrased_chunks': [None] * len(chunks),
+            'references': references,
+            'stages': {
+                'references': {'status': 'complete', 'seconds': round(reference_seconds, 3)},
+                'direct_quotes': {'status': 'running', 'seconds': 0.0},
+                'paraphrased': {'status': 'running' if chunks else 'complete', 'seconds': 0.0,
+                                'chunks_done': 0, 'chunks_failed': 0, 'chunks_total': len(chunks)}
+            },
+            'triage': {k: v for k, v in triage.items() if k != 'scores'}
+        }
+        total = len(tasks) + 1
+        done = 1
+        yield self._snapshot(analysis, 'references', done, total, start)
+
+        for name, result, seconds, error in self.executor.run(tasks, self._remaining(budget, start)):
+            done += 1
+            stage, _, index = name.partition(':')
+            timing = analysis['stages'][stage]
+            if stage == 'paraphrased':
+                analysis['paraphrased_chunks'][int(index)] = result
+                timing['chunks_failed' if error else 'chunks_done'] += 1
+                # Chunks run side by side, so the stage takes as long as the slowest one
+                timing['seconds'] = round(max(timing['seconds'], seconds), 3)
+                if timing['chunks_done'] + timing['chunks_failed'] == timing['chunks_total']:
+                    timing['status'] = 'failed' if timing['chunks_failed'] else 'complete'
+            else:
+                analysis[stage] = result or []
+                timing['seconds'] = round(seconds, 3)
+                timing['status'] = 'failed' if error else 'complete'
+            if error:
+                timing['error'] = error
+            yield self._snapshot(analysis, stage, done, total, start)
+
+        if done < total:
+            for timing in analysis['stages'].values():
+                if timing['status'] == 'running':
+                    timing['status'] = 'truncated'
+            snapshot = self._snapshot(analysis, 'truncated', done, total, start)
+            snapshot['complete'] = True
+            yield snapshot
+
+    def _snapshot(self, analysis: Dict, stage: str, done: int, total: int, start: float) -> Dict:
+        """Copy of the running analysis with a provisional score and progress"""
+        snapshot = {
+            'direct_quotes': list(analysis['direct_quotes']),
+            'paraphrased': [p for chunk in analysis['paraphrased_chunks'] if chunk for p in chunk],
+            'references': list(analysis['references']),
+            'stages': {name: dict(timing) for name, timing in analysis['stages'].items()},
+            'triage': analysis['triage'],
+            'elapsed': round(time.perf_counter() - start, 3),
+            'stage': stage,
+            'progress': done / total,
+            'complete': done == total
+        }
+        snapshot['plagiarism_score'] = self._calculate_plagiarism_score(snapshot)
+        return snapshot
+
     def _calculate_plagiarism_score(self, analysis: Dict) -> float:
         """More nuanced scoring"""
         quote_score = len(analysis['direct_quotes']) * 2  # 2% per quote
@@ -40,24 +128,51 @@ class AIService:
         
         return min(quote_score + para_score + ref_score, 100)
 
-    def analyze_image(self, image_path: str) -> Dict:
+    def analyze_image(self, image_path: str, deadline: Optional[float] = None) -> Dict:
         """Complete image analysis pipeline"""
+        budget = Config.ANALYSIS_DEADLINE if deadline is None else deadline
+        start = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=2)
         try:
-            # First get vision analysis
-            vision_analysis = self.vision_service.analyze_image(image_path)
-            
-            # Then analyze extracted text
-            text_analysis = self.analyze_content(vision_analysis.get('text', ''))
+            # Web and colour detection run alongside OCR and the text analysis
+            visuals = pool.submit(timed, partial(self.vision_service.detect_visuals, image_path))
+            ocr = pool.submit(timed, partial(self.vision_service.detect_text, image_path))
+
+            stages = {}
+            text, stages['vision_text'] = self._vision_result(ocr, '', budget, start)
+            text_analysis = self.analyze_content(text, self._remaining(budget, start))
+            empty_visuals = {'web_entities': [], 'matching_images': [], 'colors': []}
+            visual_analysis, stages['vision_visuals'] = self._vision_result(visuals, empty_visuals, budget, start)
+            # detect_visuals returns {} when the Vision call fails, so fill in the empty lists
+            vision_analysis = {'text': text, **empty_visuals, **visual_analysis}
 
             return {
                 'vision_analysis': vision_analysis,
                 'text_analysis': text_analysis,
                 'matching_images': vision_analysis.get('matching_images', []),
-                'colors': vision_analysis.get('colors', [])
+                'colors': vision_analysis.get('colors', []),
+                'stages': stages
             }
         except Exception as e:
             logging.error(f"Image analysis failed: {e}")
             return {}
+        finally:
+            pool.shutdown(wait=False)
+
+    def _vision_result(self, future, default, budget: Optional[float], start: float):
+        """Result of a timed Vision call and its stage entry, or ``default`` past the deadline"""
+        try:
+            result, seconds = future.result(timeout=self._remaining(budget, start))
+            return result, {'status': 'complete', 'seconds': round(seconds, 3)}
+        except FutureTimeoutError:
+            logging.warning("Vision request did not finish within the deadline")
+            return default, {'status': 'truncated', 'seconds': round(time.perf_counter() - start, 3)}
+
+    def _remaining(self, budget: Optional[float], start: float) -> Optional[float]:
+        """Seconds left of the analysis budget, or None when unbounded"""
+        if budget is None:
+            return None
+        return max(0.0, budget - (time.perf_counter() - start))
 
     def _find_direct_quotes(self, text: str) -> List[Dict]:
         """Better quote detection with Google Search integration"""
@@ -79,8 +194,9 @@ class AIService:
                         })
             return detected
         except Exception as e:
+            # Re-raised so the stage executor marks the quote search failed
             logging.error(f"Direct quote detection failed: {e}")
-            return []
+            raise
 
     def _google_search(self, query: str) -> List[str]:
         """Use Google Custom Search API with proper initialization"""
@@ -104,69 +220,40 @@ class AIService:
         
         except Exception as e:
             logging.error(f"Google search failed: {e}")
-            return []
+            raise
 
     def _analyze_reference_section(self, text: str) -> List[Dict]:
         """Comprehensive reference detection"""
         try:
-            # Broader section detection
-            ref_section = re.search(
-                r'(REFERENCES|BIBLIOGRAPHY|WORKS CITED|LITERATURE CITED)(.*?)($|\n\s*(APPENDIX|ACKNOWLEDG))',
-                text, 
-                re.DOTALL|re.IGNORECASE
-            )
-            
-            if not ref_section:
-                return []
-
-            references = []
-            # Split using common reference patterns
-            ref_entries = re.split(r'\n(?=\[?\d+[\.\)]? |\•|\d+\.\s|\[[A-Z]+\])', ref_section.group(2).strip())
-            
-            for entry in ref_entries:
-                if not entry.strip():
-                    continue
-
-                
-                is_valid = bool(re.search(
-                    r'(doi\.org|https?://|ISBN|\(\d{4}\))', 
-                    entry, 
-                    re.IGNORECASE
-                ))
-                
-                references.append({
-                    'reference': entry.strip(),
-                    'valid': is_valid
-                })
-                
-            return references
+            return parse_references(text)
         except Exception as e:
             logging.error(f"Reference analysis failed: {e}")
             return []
 
-    def _find_paraphrased_content(self, text: str) -> List[Dict]:
-        """Detect potentially paraphrased content"""
+    def _chunk_text(self, text: str) -> List[str]:
+        """Split text into the fixed-size chunks sent to Cohere"""
+        size = Config.PARAPHRASE_CHUNK_SIZE
+        return [text[i:i+size] for i in range(0, len(text), size)]
+
+    def _paraphrase_chunk(self, chunk: str) -> List[Dict]:
+        """Ask Cohere for paraphrased passages within a single chunk"""
         try:
-            chunks = [text[i:i+1000] for i in range(0, len(text), 1000)]
-            paraphrased = []
-            
-            for chunk in chunks:
-                response = self.co.chat(
-                    message=f"Identify potentially paraphrased content: {chunk}",
-                    model="command-r-plus",
-                    temperature=0.3
-                )
-                if response.citations:
-                    paraphrased.extend([{
-                        'text': c.text,
-                        'sources': [s.text for s in c.documents],
-                        'similarity': c.confidence
-                    } for c in response.citations])
-            
-            return paraphrased
+            response = self.co.chat(
+                message=f"Identify potentially paraphrased content: {chunk}",
+                model="command-r-plus",
+                temperature=0.3
+            )
+            if not response.citations:
+                return []
+            return [{
+                'text': c.text,
+                'sources': [s.text for s in c.documents],
+                'similarity': c.confidence
+            } for c in response.citations]
         except Exception as e:
+            # Re-raised so the stage executor counts the chunk as failed
             logging.error(f"Paraphrase detection failed: {e}")
-            return []
+            raise
 
     def calculate_similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """Calculate cosine similarity between embeddings"""
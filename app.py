@@ -6,7 +6,7 @@ from PIL import Image
 from file_processor import FileProcessor
 from ai_service import AIService
 from config import Config
-from report_generator import generate_plagiarism_report
+from report_generator import STAGE_NAMES, generate_plagiarism_report, stages_with_status
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -187,25 +187,36 @@ def handle_document():
     file = st.file_uploader("Upload Document", type=["pdf", "docx", "txt"])
     
     if file:
-        with st.spinner("Analyzing content..."):
-            fp = FileProcessor()
-            temp_path = f"temp_{file.name}"
+        fp = FileProcessor()
+        temp_path = f"temp_{file.name}"
+        
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(file.getbuffer())
             
-            try:
-                with open(temp_path, "wb") as f:
-                    f.write(file.getbuffer())
-                
+            with st.spinner("Extracting text..."):
                 text = fp.process(temp_path)
-                ai = AIService(Config.COHERE_API_KEY)
-                analysis = ai.analyze_content(text)
-                
-                display_results(text, analysis, file.name)
-                
-            except Exception as e:
-                st.error(f"Analysis failed: {str(e)}")
-            finally:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            ai = AIService(Config.COHERE_API_KEY)
+            
+            display_preview(text)
+            display_boilerplate_report(fp.boilerplate_report)
+            progress = st.progress(0.0, text="Running reference, quote and paraphrase checks...")
+            results = st.empty()
+            
+            analysis = None
+            for analysis in ai.analyze_content_stream(text):
+                progress.progress(analysis['progress'], text=progress_text(analysis))
+                with results.container():
+                    display_findings(analysis)
+            progress.empty()
+            
+            display_report_download(text, analysis, file.name)
+            
+        except Exception as e:
+            st.error(f"Analysis failed: {str(e)}")
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
     show_features()
 
 def handle_image():
@@ -275,20 +286,73 @@ def display_text_analysis(analysis):
         else:
             st.info("No paraphrased content detected")
 
-def display_results(text, analysis, filename):
+def progress_text(analysis):
+    stages = analysis.get('stages', {})
+    running = []
+    for name, timing in stages.items():
+        if timing['status'] != 'running':
+            continue
+        label = STAGE_NAMES.get(name, name)
+        if 'chunks_total' in timing:
+            label += f" ({timing['chunks_done'] + timing['chunks_failed']}/{timing['chunks_total']} passages)"
+        running.append(label)
+    if running:
+        return f"Waiting on {', '.join(running)}..."
+    if any(timing['status'] == 'truncated' for timing in stages.values()):
+        return "Time budget reached, showing partial results"
+    return "Analysis complete"
+
+
+def display_preview(text):
+    with st.expander("📄 Document Preview", expanded=True):
+        st.text_area("Full Text", value=text[:3000] + (" [...]" if len(text) > 3000 else ""), height=300)
+
+def display_boilerplate_report(report):
+    if report.get('chars_removed'):
+        st.caption(
+            f"Skipped {report['lines_removed']} boilerplate lines ({report['chars_removed']:,} characters) "
+            f"such as running headers and declarations, saving {report['api_calls_saved']} API calls"
+        )
+
+def display_findings(analysis):
     score_color = "#28a745" if analysis['plagiarism_score'] < 25 else "#fd7e14" if analysis['plagiarism_score'] < 50 else "#dc3545"
+    provisional = "" if analysis.get('complete', True) else " (provisional)"
     st.markdown(f"""
     <div class="card" style="border: 2px solid {score_color};">
-        <h3 style="color: {score_color}; text-align: center;">Plagiarism Score: {analysis['plagiarism_score']}%</h3>
+        <h3 style="color: {score_color}; text-align: center;">Plagiarism Score: {analysis['plagiarism_score']}%{provisional}</h3>
     </div>
     """, unsafe_allow_html=True)
-    
-    with st.expander("📄 Document Preview", expanded=True):
-        st.text_area("Full Text", value=text[:3000] + (" [...]" if len(text) > 3000 else ""), height=300)
+
+    truncated = stages_with_status(analysis, 'truncated')
+    if truncated:
+        st.warning(f"Time budget reached before these checks finished: {', '.join(truncated)}")
+    failed = stages_with_status(analysis, 'failed')
+    if failed:
+        st.error(f"These checks failed and their results are incomplete: {', '.join(failed)}")
 
     with st.container():
         st.markdown("### 🔍 Analysis Results")
         
+        triage = analysis.get('triage')
+        if triage and triage['chunks_sent'] < triage['chunks_total']:
+            st.caption(
+                f"Paraphrase check ran on {triage['chunks_sent']} of {triage['chunks_total']} passages; "
+                f"tables, code and passages beyond the token budget were skipped"
+            )
+        
+        st.markdown("#### Reference Validation")
+        if analysis['references']:
+            valid_refs = [r for r in analysis['references'] if r['valid']]
+            st.success(f"✅ {len(valid_refs)} Valid References Found")
+            st.error(f"❌ {len(analysis['references'])-len(valid_refs)} Invalid References")
+            
+            with st.expander("View References"):
+                for ref in analysis['references']:
+                    status = "✅ Valid" if ref['valid'] else "❌ Invalid"
+                    st.markdown(f"{status}: {ref['reference']}")
+        else:
+            st.warning("No reference section found")
+        
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("#### Direct Quotes Found")
@@ -297,6 +361,10 @@ def display_results(text, analysis, filename):
                     st.markdown(f"**Quote**: _{quote['text']}_")
                     st.markdown(f"Sources: {', '.join(quote['sources'])}")
                     st.divider()
+            elif stage_status(analysis, 'direct_quotes') == 'running':
+                st.info("Searching for direct quotes...")
+            elif stage_status(analysis, 'direct_quotes') == 'failed':
+                st.warning("Direct quote search failed")
             else:
                 st.info("No direct quotes detected")
         
@@ -307,33 +375,27 @@ def display_results(text, analysis, filename):
                     st.markdown(f"**Text**: {para['text'][:200]}...")
                     st.markdown(f"Similar Sources: {', '.join(para['sources'])}")
                     st.divider()
+            elif stage_status(analysis, 'paraphrased') == 'running':
+                st.info("Checking for paraphrased content...")
+            elif stage_status(analysis, 'paraphrased') == 'failed':
+                st.warning("Paraphrase check failed")
             else:
                 st.info("No paraphrased content detected")
-        
-        st.markdown("#### Reference Validation")
-        if analysis['references']:
-            valid_refs = [r for r in analysis['references'] if r['valid']]
-            st.success(f"✅ {len(valid_refs)} Valid References Found")
-            st.error(f"❌ {len(analysis['references'])-len(valid_refs)} Invalid References")
-            
-            with st.expander("View References"):
-                for ref in analysis['references']:
-                    status = "✅ Valid" if ref['valid'] else "❌ Invalid"
-                    st.markdown(f"{status}: {ref['reference']}")
-        else:
-            st.warning("No reference section found")
 
-        # Download Report Button
-        report_path = generate_plagiarism_report(text, analysis, filename)
-        with open(report_path, "rb") as f:
-            b64 = base64.b64encode(f.read()).decode()
-            href = f'''
-            <a class="download-btn" href="data:application/pdf;base64,{b64}" 
-               download="{filename}_report.pdf">
-               📥 Download Full Report
-            </a>
-            '''
-            st.markdown(href, unsafe_allow_html=True)
+def stage_status(analysis, stage):
+    return analysis.get('stages', {}).get(stage, {}).get('status', 'complete')
+
+def display_report_download(text, analysis, filename):
+    report_path = generate_plagiarism_report(text, analysis, filename)
+    with open(report_path, "rb") as f:
+        b64 = base64.b64encode(f.read()).decode()
+        href = f'''
+        <a class="download-btn" href="data:application/pdf;base64,{b64}" 
+           download="{filename}_report.pdf">
+           📥 Download Full Report
+        </a>
+        '''
+        st.markdown(href, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     os.makedirs("reports", exist_ok=True)
@@ -0,0 +1,212 @@
+# benchmark.py
+"""Throughput and peak-memory benchmarks for the text extraction paths.
+
+Usage:
+    python benchmark.py docx [file.docx]
+    python benchmark.py normalize [megabytes]
+    python benchmark.py references [megabytes]
+"""
+import multiprocessing
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Default Extension="png" ContentType="image/png"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="media/image1.png"/>
+</Relationships>"""
+SENTENCE = "The experimental results indicate a consistent improvement over the baseline approach. "
+
+
+def make_sample_docx(path, paragraphs=20000, image_mb=20):
+    """Write a DOCX with prose, a table every 50 paragraphs and one large image"""
+    w = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    body = []
+    for i in range(paragraphs):
+        body.append(f'<w:p><w:r><w:t xml:space="preserve">{i}. {SENTENCE * 3}</w:t></w:r></w:p>')
+        if i % 50 == 0:
+            cell = f'<w:tc><w:p><w:r><w:t>cell {i}</w:t></w:r></w:p></w:tc>'
+            body.append(f'<w:tbl><w:tr>{cell * 4}</w:tr></w:tbl>')
+    document = f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document {w}><w:body>{"".join(body)}</w:body></w:document>'
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', PACKAGE_RELS)
+        archive.writestr('word/_rels/document.xml.rels', DOCUMENT_RELS)
+        archive.writestr('word/document.xml', document)
+        # Incompressible bytes so the image costs its full size to load
+        archive.writestr('word/media/image1.png', os.urandom(image_mb * 1024 * 1024), zipfile.ZIP_STORED)
+
+
+def _python_docx(path):
+    from docx import Document
+    doc = Document(path)
+    return '\n'.join([para.text for para in doc.paragraphs])
+
+
+def _streaming(path):
+    from docx_stream import iter_docx_text
+    return '\n'.join(iter_docx_text(path))
+
+
+DOCX_EXTRACTORS = {'python-docx': _python_docx, 'streaming': _streaming}
+
+
+def _reset_peak_rss():
+    """Reset the kernel's high-water mark (Linux) and return current RSS in KB"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return _proc_status('VmRSS')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _peak_rss():
+    try:
+        return _proc_status('VmHWM')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _proc_status(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    raise OSError(f"{field} not reported")
+
+
+def _measure(name, path, queue):
+    # Runs in a fresh process so the peak reflects this extractor alone
+    extractor = DOCX_EXTRACTORS[name]
+    baseline = _reset_peak_rss()
+    start = time.perf_counter()
+    text = extractor(path)
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, _peak_rss() - baseline, len(text)))
+
+
+def bench_docx(path=None):
+    cleanup = path is None
+    if cleanup:
+        path = os.path.join(tempfile.mkdtemp(), 'sample.docx')
+        make_sample_docx(path)
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    print(f"{path} ({size_mb:.1f} MB)")
+    print(f"{'extractor':<12} {'seconds':>8} {'MB/s':>8} {'peak MB':>8} {'chars':>10}")
+
+    ctx = multiprocessing.get_context('spawn')
+    for name in DOCX_EXTRACTORS:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_measure, args=(name, path, queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            print(f"{name:<12} failed (exit code {proc.exitcode})")
+            continue
+        elapsed, peak_kb, chars = queue.get()
+        print(f"{name:<12} {elapsed:>8.2f} {size_mb / elapsed:>8.1f} {peak_kb / 1024:>8.1f} {chars:>10,}")
+
+    if cleanup:
+        os.remove(path)
+
+
+def _legacy_clean_text(text):
+    # FileProcessor._clean_text before the single-pass normalizer
+    text = re.sub(
+        r'(?:declaration|certificate|acknowledgement|appendix|table of contents)[:\s]*\n',
+        '\n',
+        text,
+        flags=re.IGNORECASE
+    )
+    text = re.sub(r'\[(\d+)\]', r'[\1]', text)
+    text = re.sub(r'["“”]', '"', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _legacy_references(text):
+    # AIService._analyze_reference_section before reference_parser
+    ref_section = re.search(
+        r'(REFERENCES|BIBLIOGRAPHY|WORKS CITED|LITERATURE CITED)(.*?)($|\n\s*(APPENDIX|ACKNOWLEDG))',
+        text,
+        re.DOTALL | re.IGNORECASE
+    )
+    if not ref_section:
+        return []
+    entries = re.split(r'\n(?=\[?\d+[\.\)]? |\•|\d+\.\s|\[[A-Z]+\])', ref_section.group(2).strip())
+    return [{'reference': e.strip(), 'valid': bool(re.search(r'(doi\.org|https?://|ISBN|\(\d{4}\))', e, re.IGNORECASE))}
+            for e in entries if e.strip()]
+
+
+def make_sample_text(megabytes):
+    """Thesis-shaped text: declaration, body pages and a long reference list"""
+    page = f"Chapter section\n{SENTENCE * 20}\nAs noted, “quoted material here” [12].\n\n"
+    refs = ''.join(f"[{i}] Author, A. ({1990 + i % 30}). Title of work {i}. https://doi.org/10.1000/{i}\n"
+                   for i in range(2000))
+    body_size = max(0, int(megabytes * 1024 * 1024) - len(refs))
+    body = page * (body_size // len(page) + 1)
+    return f"DECLARATION:\nI declare this is my work.\n{body[:body_size]}\nREFERENCES\n{refs}APPENDIX\nData tables (2020)\n"
+
+
+def _throughput(label, fn, text, repeat=3):
+    best = min(_time(fn, text) for _ in range(repeat))
+    print(f"{label:<28} {best:>8.3f}s {len(text) / 1024 / 1024 / best:>8.1f} MB/s")
+
+
+def _time(fn, text):
+    start = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - start
+
+
+def bench_normalize(megabytes='4'):
+    from text_normalizer import normalize_lines
+    text = make_sample_text(float(megabytes))
+    print(f"normalizer on {len(text) / 1024 / 1024:.1f} MB")
+    _throughput('legacy _clean_text', _legacy_clean_text, text)
+    _throughput('normalize_lines', lambda t: '\n'.join(normalize_lines(t.splitlines())), text)
+
+
+def bench_references(megabytes='4'):
+    from reference_parser import parse_references
+    from text_normalizer import clean_text
+    # Parse what FileProcessor would hand over, so the section end must survive cleaning
+    text = clean_text(make_sample_text(float(megabytes)))
+    references = parse_references(text)
+    assert len(references) == 2000 and 'Data tables' not in references[-1]['reference']
+    print(f"reference parsing on {len(text) / 1024 / 1024:.1f} MB")
+    _throughput('legacy regex', _legacy_references, text)
+    _throughput('parse_references', parse_references, text)
+
+    # A heading followed by a long whitespace run makes the lazy
+    # (.*?)(\n\s*APPENDIX) alternative rescan the run from every newline
+    for size in (5000, 10000, 20000):
+        text = 'REFERENCES' + '\n ' * size + 'x'
+        print(f"heading + {size} blank lines")
+        _throughput('  legacy regex', _legacy_references, text, repeat=1)
+        _throughput('  parse_references', parse_references, text, repeat=1)
+
+
+BENCHMARKS = {'docx': bench_docx, 'normalize': bench_normalize, 'references': bench_references}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(__doc__)
+        sys.exit(1)
+    BENCHMARKS[sys.argv[1]](*sys.argv[2:])
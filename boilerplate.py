@@ -0,0 +1,117 @@
+# boilerplate.py
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from typing import Dict, List, Set, Tuple
+from config import Config
+from reference_parser import is_section_end
+
+PAGE_BREAK = '\f'
+
+
+class BoilerplateFilter:
+    def __init__(self, templates_path: str = Config.BOILERPLATE_TEMPLATES,
+                 page_ratio: float = Config.BOILERPLATE_PAGE_RATIO):
+        """Strip running headers/footers and known template text before analysis"""
+        self.page_ratio = page_ratio
+        self.shingle_size = Config.BOILERPLATE_SHINGLE_SIZE
+        self.template_lines, self.template_shingles = self._load_templates(templates_path)
+
+    def strip(self, text: str) -> Tuple[str, Dict]:
+        """Remove boilerplate lines from page-separated text.
+
+        Pages are delimited by form feeds. A line counts as boilerplate when
+        its normalised hash appears on at least ``page_ratio`` of the pages
+        (headers, footers, page numbers) or when it matches the template
+        store (declarations, certificate wording).
+        """
+        pages = [page.split('\n') for page in text.split(PAGE_BREAK)]
+        repeated = self._repeated_lines(pages)
+
+        kept_pages = []
+        lines_removed = 0
+        for lines in pages:
+            kept = []
+            for line in lines:
+                key = self._line_key(line)
+                # Section-end headings are kept; the reference parser stops at them
+                if key and not is_section_end(line) and (self._hash(key) in repeated or self._is_template(key)):
+                    lines_removed += 1
+                else:
+                    kept.append(line)
+            kept_pages.append('\n'.join(kept))
+
+        stripped = PAGE_BREAK.join(kept_pages)
+        return stripped, self._report(text, stripped, lines_removed)
+
+    def _repeated_lines(self, pages: List[List[str]]) -> Set[bytes]:
+        if len(pages) < Config.BOILERPLATE_MIN_PAGES:
+            return set()
+
+        page_counts = {}
+        for lines in pages:
+            for digest in {self._hash(key) for key in map(self._line_key, lines) if key}:
+                page_counts[digest] = page_counts.get(digest, 0) + 1
+
+        threshold = max(2, math.ceil(self.page_ratio * len(pages)))
+        return {digest for digest, count in page_counts.items() if count >= threshold}
+
+    def _is_template(self, key: str) -> bool:
+        if self._hash(key) in self.template_lines:
+            return True
+        shingles = self._shingles(key)
+        if not shingles:
+            return False
+        hits = sum(1 for shingle in shingles if shingle in self.template_shingles)
+        return hits / len(shingles) >= Config.BOILERPLATE_TEMPLATE_MATCH
+
+    def _shingles(self, key: str) -> List[bytes]:
+        words = key.split(' ')
+        n = self.shingle_size
+        return [self._hash(' '.join(words[i:i+n])) for i in range(len(words) - n + 1)]
+
+    def _load_templates(self, path: str) -> Tuple[Set[bytes], Set[bytes]]:
+        lines, shingles = set(), set()
+        if not os.path.exists(path):
+            return lines, shingles
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                templates = json.load(f).get('templates', [])
+        except Exception as e:
+            logging.error(f"Boilerplate template store could not be loaded: {e}")
+            return lines, shingles
+
+        for template in templates:
+            for line in template.split('\n'):
+                key = self._line_key(line)
+                if key:
+                    lines.add(self._hash(key))
+            shingles.update(self._shingles(self._line_key(template)))
+        return lines, shingles
+
+    def _report(self, before: str, after: str, lines_removed: int) -> Dict:
+        return {
+            'lines_removed': lines_removed,
+            'chars_removed': len(before) - len(after)
+        }
+
+    @staticmethod
+    def chunks_saved(before: str, after: str) -> int:
+        """Cohere chunks no longer sent, given the cleaned text with and without boilerplate.
+
+        Quote searches are already de-duplicated, so only Cohere chunks shrink.
+        """
+        size = Config.PARAPHRASE_CHUNK_SIZE
+        return math.ceil(len(before) / size) - math.ceil(len(after) / size)
+
+    @staticmethod
+    def _line_key(line: str) -> str:
+        """Lowercase, digits masked and whitespace collapsed so 'Page 3' == 'Page 4'"""
+        return re.sub(r'\d+', '#', ' '.join(line.lower().split()))
+
+    @staticmethod
+    def _hash(key: str) -> bytes:
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
@@ -19,6 +19,23 @@ class Config:
     MAX_FILE_SIZE = 50  # MB
     ALLOWED_EXTENSIONS = [".pdf", ".docx", ".txt", ".png", ".jpg", ".jpeg"]
     REQUIRED_DIRS = ["data", "uploads", "reports", "secrets"]
+    PARAPHRASE_CHUNK_SIZE = 1000  # characters per Cohere paraphrase request
+    ANALYSIS_DEADLINE = 120  # seconds before unfinished stages are truncated
+    STAGE_WORKERS = 8  # concurrent stage / chunk requests per analysis
+
+    # Boilerplate suppression
+    BOILERPLATE_TEMPLATES = os.path.join(Path(__file__).parent, "Data/boilerplate_templates.json")
+    BOILERPLATE_MIN_PAGES = 3  # pages needed before repeated-line detection kicks in
+    BOILERPLATE_PAGE_RATIO = 0.5  # share of pages a line must appear on to be stripped
+    BOILERPLATE_SHINGLE_SIZE = 5  # words per template shingle
+    BOILERPLATE_TEMPLATE_MATCH = 0.8  # share of a line's shingles found in templates
+
+    # Lexical triage before paraphrase detection
+    # Reference texts for BM25 scoring; while empty, chunks are ranked by prose share only
+    DOCUMENT_DB = os.path.join(Path(__file__).parent, "Data/documents.json")
+    TRIAGE_THRESHOLD = 0.15  # suspicion score that puts a chunk first in line for Cohere
+    TRIAGE_MIN_PROSE = 0.3  # chunks with less prose (tables, code, data) are never sent
+    TRIAGE_TOKEN_BUDGET = None  # estimated Cohere tokens per document; None checks every prose chunk
 
     @classmethod
     def validate_paths(cls):
@@ -0,0 +1,73 @@
+# docx_stream.py
+import re
+import zipfile
+from typing import Iterator, List
+from xml.etree.ElementTree import iterparse
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+PARAGRAPH = W + 'p'
+TABLE = W + 'tbl'
+RUN = W + 'r'
+TEXT = W + 't'
+BREAKS = {W + 'br': '\n', W + 'cr': '\n', W + 'tab': '\t'}
+
+
+def iter_docx_text(path: str) -> Iterator[str]:
+    """Yield paragraph text from a DOCX without building the object model.
+
+    Parts are read straight from the zip with an incremental parser, so
+    embedded media is never loaded. Headers, footers, footnotes and
+    endnotes come first and the body (including tables and text boxes)
+    last, so page furniture can never run on into the closing reference
+    list. The body itself is yielded in document order.
+    """
+    with zipfile.ZipFile(path) as archive:
+        for part in _text_parts(archive.namelist()):
+            with archive.open(part) as stream:
+                yield from _iter_part(stream)
+
+
+def _text_parts(names: List[str]) -> List[str]:
+    def numbered(prefix):
+        pattern = re.compile(rf'word/{prefix}(\d*)\.xml$')
+        matches = [(m.group(1), name) for name in names for m in [pattern.match(name)] if m]
+        return [name for _, name in sorted(matches, key=lambda m: int(m[0] or 0))]
+
+    parts = numbered('header') + numbered('footer') + ['word/footnotes.xml', 'word/endnotes.xml', 'word/document.xml']
+    return [part for part in parts if part in names]
+
+
+def _iter_part(stream) -> Iterator[str]:
+    # Text boxes are stored twice, as DrawingML and as a VML fallback; only
+    # the first copy is read
+    fallback_depth = 0
+    parents = []
+    paragraphs = []
+
+    for event, elem in iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif elem.tag == PARAGRAPH and not fallback_depth:
+                paragraphs.append([])
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if elem.tag == MC_FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif elem.tag == TEXT and paragraphs:
+            paragraphs[-1].append(elem.text or '')
+        elif elem.tag in BREAKS and paragraphs and parents[-1].tag == RUN:
+            paragraphs[-1].append(BREAKS[elem.tag])
+        elif elem.tag == PARAGRAPH:
+            yield ''.join(paragraphs.pop())
+
+        # Drop finished blocks so memory stays flat on long documents
+        if elem.tag in (PARAGRAPH, TABLE) and parents:
+            elem.clear()
+            parents[-1].remove(elem)
@@ -1,8 +1,9 @@
 import PyPDF2
-from docx import Document
 import pytesseract
 from PIL import Image
-import re
+from boilerplate import BoilerplateFilter, PAGE_BREAK
+from docx_stream import iter_docx_text
+from text_normalizer import clean_text
 
 class FileProcessor:
     ACADEMIC_SECTIONS = [
@@ -15,9 +16,17 @@ class FileProcessor:
         r"table of contents"
     ]
 
+    def __init__(self):
+        self.boilerplate = BoilerplateFilter()
+        self.boilerplate_report = {}
+
     def process(self, file_path: str) -> str:
         raw_text = self._process_file(file_path)
-        return self._clean_text(raw_text)
+        stripped, self.boilerplate_report = self.boilerplate.strip(raw_text)
+        text = self._clean_text(stripped)
+        # Chunks are cut from the cleaned text, so compare chunk counts after cleaning
+        self.boilerplate_report['api_calls_saved'] = self.boilerplate.chunks_saved(self._clean_text(raw_text), text)
+        return text
 
     def _process_file(self, file_path: str) -> str:
         if file_path.endswith('.pdf'):
@@ -30,20 +39,8 @@ class FileProcessor:
             return self._process_txt(file_path)
 
     def _clean_text(self, text: str) -> str:
-        """Less aggressive cleaning that preserves citations"""
-        # Remove section headers but keep content
-        text = re.sub(
-            r'(?:declaration|certificate|acknowledgement|appendix|table of contents)[:\s]*\n',
-            '\n', 
-            text, 
-            flags=re.IGNORECASE
-        )
-        
-        # Preserve citations and quotes
-        text = re.sub(r'\[(\d+)\]', r'[\1]', text)  # Keep citation numbers
-        text = re.sub(r'["“”]', '"', text)  # Normalize quotes
-        
-        return re.sub(r'\s+', ' ', text).strip()
+        """Less aggressive cleaning that preserves citations and line breaks"""
+        return clean_text(text)
     # Processing methods 
     def _process_pdf(self, path: str) -> str:
         text = []
@@ -51,11 +48,10 @@ class FileProcessor:
             reader = PyPDF2.PdfReader(f)
             for page in reader.pages:
                 text.append(page.extract_text() or "")
-        return '\n'.join(text)
+        return PAGE_BREAK.join(text)
 
     def _process_docx(self, path: str) -> str:
-        doc = Document(path)
-        return '\n'.join([para.text for para in doc.paragraphs])
+        return '\n'.join(iter_docx_text(path))
 
     def _process_image(self, path: str) -> str:
         return pytesseract.image_to_string(Image.open(path))
@@ -17,26 +17,39 @@ class GoogleVisionService:
 
     def analyze_image(self, image_path):
         """Perform advanced image analysis using Google Vision API"""
+        return {'text': self.detect_text(image_path), **self.detect_visuals(image_path)}
+
+    def detect_text(self, image_path):
+        """OCR only, so text analysis can start before web detection returns"""
+        response = self._annotate(image_path, [vision.Feature.Type.TEXT_DETECTION])
+        if response is None:
+            return ''
+        return response.text_annotations[0].description if response.text_annotations else ''
+
+    def detect_visuals(self, image_path):
+        """Web matches and dominant colours for an image"""
+        response = self._annotate(image_path, [
+            vision.Feature.Type.WEB_DETECTION,
+            vision.Feature.Type.IMAGE_PROPERTIES
+        ])
+        if response is None:
+            return {}
+        return {
+            'web_entities': [entity.description for entity in response.web_detection.web_entities],
+            'matching_images': [img.url for img in response.web_detection.full_matching_images],
+            'colors': response.image_properties_annotation.dominant_colors.colors
+        }
+
+    def _annotate(self, image_path, feature_types):
         try:
             with open(image_path, 'rb') as image_file:
                 content = image_file.read()
 
             image = vision.Image(content=content)
-            response = self.client.annotate_image({
+            return self.client.annotate_image({
                 'image': image,
-                'features': [
-                    {'type_': vision.Feature.Type.TEXT_DETECTION},
-                    {'type_': vision.Feature.Type.WEB_DETECTION},
-                    {'type_': vision.Feature.Type.IMAGE_PROPERTIES}
-                ]
+                'features': [{'type_': feature_type} for feature_type in feature_types]
             })
-
-            return {
-                'text': response.text_annotations[0].description if response.text_annotations else '',
-                'web_entities': [entity.description for entity in response.web_detection.web_entities],
-                'matching_images': [img.url for img in response.web_detection.full_matching_images],
-                'colors': response.image_properties_annotation.dominant_colors.colors
-            }
         except Exception as e:
             logging.error(f"Image analysis failed: {e}")
-            return {}
\ No newline at end of file
+            return None
\ No newline at end of file
@@ -0,0 +1,225 @@
+# lexical_filter.py
+import json
+import logging
+import math
+import os
+import re
+import sys
+import unicodedata
+from typing import Dict, List, Optional
+from config import Config
+
+STOPWORDS = {
+    'the', 'and', 'for', 'are', 'was', 'were', 'with', 'that', 'this', 'from', 'have', 'has',
+    'had', 'not', 'but', 'which', 'their', 'they', 'its', 'been', 'can', 'also', 'into', 'these',
+    'those', 'such', 'than', 'then', 'there', 'will', 'would', 'should', 'may', 'our', 'your'
+}
+CHARS_PER_TOKEN = 4
+PROMPT_TOKENS = 12  # "Identify potentially paraphrased content: " plus chat overhead
+
+
+def _combining_marks() -> str:
+    """Regex class body for the BMP's combining marks, which re's \\w leaves out"""
+    ranges, start = [], None
+    for code in range(0x10001):
+        is_mark = code < 0x10000 and unicodedata.category(chr(code)).startswith('M')
+        if is_mark and start is None:
+            start = code
+        elif not is_mark and start is not None:
+            ranges.append(f'\\u{start:04x}-\\u{code - 1:04x}')
+            start = None
+    return ''.join(ranges)
+
+
+# A letter in any script, including the vowel signs of Indic scripts
+LETTER = rf'(?:[^\W\d_]|[{_combining_marks()}])'
+TERM = re.compile(rf'[^\W\d_]{LETTER}{{2,}}')
+PROSE_WORD = re.compile(rf"[^\W\d_](?:{LETTER}|['\-])*[,.;:!?\u0964\u3001\u3002\uff0c]?")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TERM.findall(text.lower()) if t not in STOPWORDS]
+
+
+def estimate_tokens(chunk: str) -> int:
+    return PROMPT_TOKENS + math.ceil(len(chunk) / CHARS_PER_TOKEN)
+
+
+class LexicalTriage:
+    K1 = 1.5
+    B = 0.75
+    _index_cache = {}
+
+    def __init__(self, corpus: Optional[List[str]] = None, db_path: str = Config.DOCUMENT_DB):
+        """BM25 pre-filter that decides which chunks are worth an LLM call"""
+        if corpus is None:
+            self.index = self._cached_index(db_path)
+        else:
+            self.index = self._build_index(corpus)
+
+    def score(self, chunk: str) -> float:
+        """Suspicion score in [0, 1] for a single chunk.
+
+        Prose share (alphabetic words over all tokens) discounts tables, code
+        and data dumps. When a local reference corpus exists it is multiplied
+        by the best BM25 match, normalised so that a verbatim copy scores about 1.
+        """
+        prose = self.prose_share(chunk)
+        if not prose or not self.index['docs']:
+            return round(prose, 4)
+        return round(prose * self._bm25_match(tokenize(chunk)), 4)
+
+    @staticmethod
+    def prose_share(chunk: str) -> float:
+        words = chunk.split()
+        if not words:
+            return 0.0
+        return sum(1 for w in words if PROSE_WORD.fullmatch(w)) / len(words)
+
+    def select(self, chunks: List[str], token_budget: Optional[int] = Config.TRIAGE_TOKEN_BUDGET,
+               threshold: float = Config.TRIAGE_THRESHOLD) -> Dict:
+        """Pick the chunks to send within the token budget.
+
+        Chunks scoring at least ``threshold`` go first, highest score first.
+        Whatever budget is left goes to the remaining prose chunks in order
+        of prose share, so a chunk with no local match can still reach
+        Cohere, which checks it against external sources. Chunks below
+        Config.TRIAGE_MIN_PROSE (tables, code, data) are never sent. Returns
+        the selected indices in document order with the per-chunk scores and
+        token accounting for the report.
+        """
+        scores = [self.score(chunk) for chunk in chunks]
+        prose = [self.prose_share(chunk) for chunk in chunks]
+        eligible = [i for i in range(len(chunks)) if prose[i] >= Config.TRIAGE_MIN_PROSE]
+        suspicious = sorted((i for i in eligible if scores[i] >= threshold), key=lambda i: -scores[i])
+        rest = sorted((i for i in eligible if scores[i] < threshold), key=lambda i: -prose[i])
+
+        selected, tokens, by_score = [], 0, 0
+        for i in suspicious + rest:
+            cost = estimate_tokens(chunks[i])
+            if token_budget is not None and tokens + cost > token_budget:
+                continue
+            selected.append(i)
+            tokens += cost
+            by_score += scores[i] >= threshold
+
+        return {
+            'selected': sorted(selected),
+            'scores': scores,
+            'chunks_total': len(chunks),
+            'chunks_sent': len(selected),
+            'chunks_above_threshold': by_score,
+            'tokens_sent': tokens,
+            'tokens_total': sum(estimate_tokens(c) for c in chunks),
+            'token_budget': token_budget
+        }
+
+    def evaluate(self, samples: List[Dict], token_budgets: List[Optional[int]],
+                 threshold: float = Config.TRIAGE_THRESHOLD) -> List[Dict]:
+        """Recall/cost tradeoff of select() over labelled chunks, per token budget.
+
+        Each sample is {'document', 'text', 'suspicious'}; chunks are grouped
+        by document and run through select() exactly as the pipeline does.
+        The budget is what trades recall for cost: ``threshold`` only decides
+        which chunks are sent first when the budget runs short. Recall is the
+        share of suspicious chunks sent and cost the share of estimated
+        tokens sent.
+        """
+        documents = {}
+        for sample in samples:
+            documents.setdefault(sample.get('document', ''), []).append(sample)
+        positives = sum(1 for s in samples if s['suspicious'])
+
+        rows = []
+        for token_budget in token_budgets:
+            hits = sent = tokens_sent = tokens_total = 0
+            for chunks in documents.values():
+                report = self.select([c['text'] for c in chunks], token_budget, threshold)
+                hits += sum(1 for i in report['selected'] if chunks[i]['suspicious'])
+                sent += report['chunks_sent']
+                tokens_sent += report['tokens_sent']
+                tokens_total += report['tokens_total']
+            rows.append({
+                'token_budget': token_budget,
+                'recall': hits / positives if positives else 1.0,
+                'chunks_sent': sent,
+                'cost': tokens_sent / tokens_total if tokens_total else 0.0
+            })
+        return rows
+
+    def _bm25_match(self, terms: List[str]) -> float:
+        index = self.index
+        doc_scores = {}
+        ceiling = 0.0
+        for term in set(terms):
+            postings = index['postings'].get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (len(index['docs']) - len(postings) + 0.5) / (len(postings) + 0.5))
+            ceiling += idf
+            for doc_id, tf in postings:
+                norm = self.K1 * (1 - self.B + self.B * index['docs'][doc_id] / index['avgdl'])
+                doc_scores[doc_id] = doc_scores.get(doc_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+
+        # Ceiling is one occurrence of every query term in an average-length
+        # document; terms unseen in the corpus still count towards it
+        unseen = sum(1 for term in set(terms) if term not in index['postings'])
+        ceiling += unseen * math.log(1 + len(index['docs']) + 0.5)
+        if not doc_scores or ceiling == 0:
+            return 0.0
+        return min(max(doc_scores.values()) / ceiling, 1.0)
+
+    @classmethod
+    def _cached_index(cls, db_path: str) -> Dict:
+        mtime = os.path.getmtime(db_path) if os.path.exists(db_path) else None
+        cached = cls._index_cache.get(db_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        index = cls._build_index(cls._load_corpus(db_path))
+        cls._index_cache[db_path] = (mtime, index)
+        return index
+
+    @staticmethod
+    def _load_corpus(db_path: str) -> List[str]:
+        if not os.path.exists(db_path):
+            return []
+        try:
+            with open(db_path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logging.error(f"Reference corpus could not be loaded: {e}")
+            return []
+        documents = data.get('documents', []) if isinstance(data, dict) else data
+        return [doc.get('content', '') for doc in documents if doc.get('content')]
+
+    @staticmethod
+    def _build_index(corpus: List[str]) -> Dict:
+        postings, lengths = {}, []
+        for doc_id, content in enumerate(corpus):
+            terms = tokenize(content)
+            lengths.append(len(terms))
+            counts = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((doc_id, tf))
+        return {
+            'postings': postings,
+            'docs': lengths,
+            'avgdl': (sum(lengths) / len(lengths)) if lengths and sum(lengths) else 1.0
+        }
+
+
+if __name__ == "__main__":
+    # Usage: python lexical_filter.py Data/triage_samples.json [budget,budget,...]
+    # The sample file holds {"corpus": [...], "samples": [...]}; without a
+    # corpus the configured document store is used. Budgets are estimated
+    # tokens per document, "none" for unlimited.
+    with open(sys.argv[1], 'r') as f:
+        data = json.load(f)
+    budgets = [None if b == 'none' else int(b)
+               for b in (sys.argv[2] if len(sys.argv) > 2 else 'none,400,300,200,100').lower().split(',')]
+    triage = LexicalTriage(corpus=data.get('corpus'))
+    print(f"{'budget':>7}  {'recall':>6}  {'sent':>5}  {'cost':>5}")
+    for row in triage.evaluate(data['samples'], budgets):
+        print(f"{str(row['token_budget']):>7}  {row['recall']:>6.1%}  {row['chunks_sent']:>5}  {row['cost']:>5.1%}")
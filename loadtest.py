@@ -0,0 +1,342 @@
+# loadtest.py
+"""Concurrent load test for the document and image analysis entry points.
+
+Replays a mix of submissions at Poisson arrival rates against
+FileProcessor.process + AIService.analyze_content and AIService.analyze_image,
+with Cohere, Google Search and Vision replaced by local fakes whose latency
+follows a log-normal distribution. Each deployment configuration (worker
+count x stage workers) is stepped through the arrival rates until it
+saturates.
+
+Usage:
+    python loadtest.py --rates 0.5,1,2,4,8 --workers 1,2,4 --duration 30
+"""
+import argparse
+import math
+import os
+import random
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.util import Finalize
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from ai_service import AIService
+from config import Config
+from file_processor import FileProcessor
+from json_db import JSONDatabase
+
+SENTENCE = ("Prior work has shown that transformer models generalise well to unseen domains "
+            "when trained on sufficiently diverse corpora. ")
+QUOTE = '"deep learning allows computational models to learn representations of data"'
+QUOTES = [
+    QUOTE,
+    '"attention mechanisms let a model weigh every input position against every other"',
+    '"most of the gains come from scaling data rather than from architectural changes"',
+    '"benchmark accuracy is a poor proxy for robustness in deployed systems"'
+]
+LEADS = ["Prior work has shown that", "Several studies report that", "It is widely assumed that",
+         "Our experiments suggest that", "Recent surveys argue that", "Earlier results indicated that"]
+TOPICS = ["transformer models", "convolutional networks", "graph neural networks", "retrieval systems",
+          "language models", "speech recognisers", "reinforcement learning agents", "recommender systems"]
+CLAIMS = ["generalise well to unseen domains", "degrade under distribution shift",
+          "benefit from larger training corpora", "are sensitive to hyperparameter choices",
+          "overfit small benchmark datasets", "require careful regularisation",
+          "transfer poorly across languages", "converge faster with curriculum learning"]
+CONDITIONS = ["when trained on sufficiently diverse corpora", "in low-resource settings",
+              "under adversarial evaluation", "on noisy real-world data",
+              "after task-specific fine-tuning", "with limited compute budgets"]
+
+
+class LatencyModel:
+    def __init__(self, median: float, sigma: float, scale: float = 1.0):
+        """Log-normal latency in seconds, the usual shape of remote API calls"""
+        self.mu = math.log(median * scale)
+        self.sigma = sigma
+
+    def sleep(self):
+        time.sleep(random.lognormvariate(self.mu, self.sigma))
+
+
+class FakeCohereClient:
+    def __init__(self, latency: LatencyModel, hit_rate: float = 0.2):
+        self.latency = latency
+        self.hit_rate = hit_rate
+
+    def chat(self, message: str, model: str, temperature: float):
+        self.latency.sleep()
+        citations = []
+        if random.random() < self.hit_rate:
+            citations.append(SimpleNamespace(
+                text=message[45:145],
+                documents=[SimpleNamespace(text="https://example.org/source")],
+                confidence=random.uniform(0.6, 0.95)
+            ))
+        return SimpleNamespace(citations=citations)
+
+
+class FakeVisionService:
+    def __init__(self, ocr_latency: LatencyModel, web_latency: LatencyModel):
+        self.ocr_latency = ocr_latency
+        self.web_latency = web_latency
+
+    def detect_text(self, image_path: str) -> str:
+        self.ocr_latency.sleep()
+        return f"Figure 2. {QUOTE} {SENTENCE * 4}"
+
+    def detect_visuals(self, image_path: str) -> Dict:
+        self.web_latency.sleep()
+        return {'web_entities': ['diagram'], 'matching_images': [], 'colors': []}
+
+
+class LoadTestAIService(AIService):
+    def __init__(self, backends: Dict):
+        super().__init__(None, client=FakeCohereClient(backends['cohere']),
+                         vision_service=FakeVisionService(backends['ocr'], backends['web']))
+        self.search_latency = backends['search']
+        self.searches = 0
+
+    def _google_search(self, query: str) -> List[str]:
+        self.searches += 1
+        self.search_latency.sleep()
+        return ["https://example.org/quoted"]
+
+
+def make_document(pages: int) -> str:
+    """Page-separated text with running headers, quotes and a reference list
+
+    Only the department header and the "Page N" footer repeat; the body is
+    sampled per page (seeded by the page number, so documents are
+    reproducible) so the boilerplate filter leaves it for analysis.
+    """
+    body = []
+    for page in range(1, pages + 1):
+        rng = random.Random(page)
+        paragraphs = []
+        for _ in range(3):
+            sentences = [f"{rng.choice(LEADS)} {rng.choice(TOPICS)} {rng.choice(CLAIMS)} {rng.choice(CONDITIONS)}."
+                         for _ in range(9)]
+            paragraphs.append(' '.join(sentences))
+        paragraphs[1] += f" As one survey puts it, {rng.choice(QUOTES)}."
+        body.append(f"Department of Computer Science\nSection {page}. " + '\n'.join(paragraphs) + f"\nPage {page}")
+    body[-1] += ("\nREFERENCES\n1. LeCun, Y. (2015). Deep learning. Nature. https://doi.org/10.1038/nature14539"
+                 "\n2. Lecture notes, unpublished")
+    return '\f'.join(body)
+
+
+# Per-worker state, set up once in each worker process (or once in thread mode)
+_worker = {}
+
+
+def init_worker(settings: Dict):
+    scale = settings['latency_scale']
+    Config.STAGE_WORKERS = settings['stage_workers']
+    _worker['settings'] = settings
+    _worker['backends'] = {
+        'cohere': LatencyModel(1.2, 0.5, scale),
+        'search': LatencyModel(0.35, 0.4, scale),
+        'ocr': LatencyModel(0.6, 0.3, scale),
+        'web': LatencyModel(1.5, 0.5, scale)
+    }
+    _worker['tmpdir'] = tempfile.mkdtemp(prefix='loadtest_')
+    # Each worker gets its own temp dir; Finalize also runs in pool processes
+    Finalize(None, shutil.rmtree, args=(_worker['tmpdir'], True), exitpriority=0)
+    if settings['persist']:
+        _worker['db'] = JSONDatabase(os.path.join(settings['shared_dir'], 'documents.json'))
+
+
+def run_submission(kind: str, scheduled: float) -> Dict:
+    """Run one submission end to end and report latency and resource use"""
+    settings = _worker['settings']
+    # A pool process runs one submission at a time, so its process CPU
+    # (stage threads included) belongs to this request. In thread mode the
+    # process is shared and CPU is measured per level in run_level instead.
+    cpu_start = time.process_time()
+    started = time.time()
+    error = None
+    chunks_sent = quote_searches = None
+    fd, path = tempfile.mkstemp(dir=_worker['tmpdir'], suffix='.png' if kind == 'image' else '.txt')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write('' if kind == 'image' else make_document(settings['doc_pages']))
+        ai = LoadTestAIService(_worker['backends'])
+        if kind == 'image':
+            result = ai.analyze_image(path)
+        else:
+            text = FileProcessor().process(path)
+            result = ai.analyze_content(text)
+            chunks_sent = result['triage']['chunks_sent']
+            quote_searches = ai.searches
+            if 'db' in _worker:
+                _worker['db'].create({'content': text[:2000], 'plagiarism_score': result['plagiarism_score']})
+        if not result:
+            error = "empty result"
+        elif kind == 'document' and not chunks_sent:
+            # Nothing reached the fake backends, so latency would say nothing about them
+            error = "document sent no chunks to Cohere"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        os.remove(path)
+
+    return {
+        'kind': kind,
+        'worker': str(os.getpid()),
+        'finished': time.time(),
+        'latency': time.time() - scheduled,
+        'queued': started - scheduled,
+        'cpu': time.process_time() - cpu_start if settings['mode'] == 'process' else None,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'chunks_sent': chunks_sent,
+        'quote_searches': quote_searches,
+        'error': error
+    }
+
+
+def run_level(settings: Dict, rate: float, duration: float) -> Dict:
+    """Offer Poisson arrivals at ``rate`` per second for ``duration`` seconds"""
+    if settings['mode'] == 'thread':
+        init_worker(settings)
+        pool = ThreadPoolExecutor(max_workers=settings['workers'])
+    else:
+        pool = ProcessPoolExecutor(max_workers=settings['workers'], initializer=init_worker, initargs=(settings,))
+
+    rng = random.Random(settings['seed'])
+    futures = []
+    with pool:
+        # Warm the workers so process start-up is not counted as latency
+        for future in [pool.submit(time.sleep, 0) for _ in range(settings['workers'])]:
+            future.result()
+        start = time.time()
+        cpu_start = time.process_time()
+        arrival = start
+        while True:
+            arrival += rng.expovariate(rate)
+            if arrival - start > duration:
+                break
+            time.sleep(max(0.0, arrival - time.time()))
+            kind = 'image' if rng.random() < settings['image_share'] else 'document'
+            futures.append(pool.submit(run_submission, kind, arrival))
+        results = [future.result() for future in futures]
+    process_cpu = time.process_time() - cpu_start if settings['mode'] == 'thread' else None
+    return summarise(results, rate, start, duration, process_cpu)
+
+
+def summarise(results: List[Dict], rate: float, start: float, duration: float,
+              process_cpu: Optional[float] = None) -> Dict:
+    """Aggregate one level; ``process_cpu`` is the whole-process CPU in thread mode"""
+    ok = [r for r in results if not r['error']]
+    # Throughput is measured over the arrival window, or longer if a backlog
+    # was still draining after the last arrival
+    elapsed = max([duration] + [r['finished'] - start for r in results])
+    latencies = sorted(r['latency'] for r in ok)
+    documents = [r for r in ok if r['kind'] == 'document']
+
+    workers = {}
+    if process_cpu is not None:
+        # Threads share one process, so CPU and RSS are only meaningful for
+        # the process as a whole
+        workers[f"{os.getpid()} (all threads)"] = {
+            'requests': len(results),
+            'cpu': process_cpu,
+            'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        }
+    else:
+        for r in results:
+            w = workers.setdefault(r['worker'], {'requests': 0, 'cpu': 0.0, 'max_rss_mb': 0.0})
+            w['requests'] += 1
+            w['cpu'] += r['cpu']
+            w['max_rss_mb'] = max(w['max_rss_mb'], r['max_rss_mb'])
+
+    return {
+        'rate': rate,
+        'requests': len(results),
+        'offered': len(results) / duration,
+        'throughput': len(ok) / elapsed if elapsed else 0.0,
+        'error_rate': (len(results) - len(ok)) / len(results) if results else 0.0,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'queued_p95': percentile(sorted(r['queued'] for r in ok), 95),
+        'workers': workers,
+        'documents': len(documents),
+        'chunks_per_doc': statistics.mean(r['chunks_sent'] for r in documents) if documents else 0.0,
+        'searches_per_doc': statistics.mean(r['quote_searches'] for r in documents) if documents else 0.0,
+        'errors': sorted({r['error'] for r in results if r['error']})
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float('nan')
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[min(98, max(0, int(pct) - 1))]
+
+
+def is_saturated(level: Dict, args) -> bool:
+    return (level['throughput'] < 0.9 * level['offered']
+            or level['p95'] > args.slo
+            or level['error_rate'] > args.max_error_rate)
+
+
+def print_level(level: Dict):
+    print(f"  {level['rate']:>6.2f}/s  sent {level['requests']:>4}  "
+          f"thru {level['throughput']:>6.2f}/s  p50 {level['p50']:>6.2f}s  p95 {level['p95']:>6.2f}s  "
+          f"p99 {level['p99']:>6.2f}s  queued p95 {level['queued_p95']:>6.2f}s  err {level['error_rate']:>5.1%}")
+    print(f"      {level['documents']} documents, {level['chunks_per_doc']:.1f} Cohere chunks and "
+          f"{level['searches_per_doc']:.1f} quote searches per document")
+    for name, w in sorted(level['workers'].items()):
+        print(f"      process {name:<20} {w['requests']:>4} req  "
+              f"{w['cpu'] / w['requests'] * 1000:>7.1f} ms CPU/req  {w['max_rss_mb']:>7.1f} MB peak RSS")
+    for error in level['errors']:
+        print(f"      error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--rates', default='0.5,1,2,4,8', help="arrival rates to step through, per second")
+    parser.add_argument('--workers', default='1,2,4', help="worker counts to test")
+    parser.add_argument('--stage-workers', default=str(Config.STAGE_WORKERS), help="Config.STAGE_WORKERS values to test")
+    parser.add_argument('--mode', choices=['process', 'thread'], default='thread',
+                        help="thread matches one Streamlit server; process models several replicas")
+    parser.add_argument('--duration', type=float, default=30, help="seconds of arrivals per level")
+    parser.add_argument('--image-share', type=float, default=0.2, help="fraction of submissions that are images")
+    parser.add_argument('--doc-pages', type=int, default=20, help="pages per synthetic document")
+    parser.add_argument('--latency-scale', type=float, default=1.0, help="multiplier on fake API latencies")
+    parser.add_argument('--persist', action='store_true', help="also write each result to a shared JSONDatabase")
+    parser.add_argument('--slo', type=float, default=30.0, help="p95 latency (s) above which a level is saturated")
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    shared_dir = tempfile.mkdtemp(prefix='loadtest_db_')
+    rates = [float(r) for r in args.rates.split(',')]
+    try:
+        for workers in [int(w) for w in args.workers.split(',')]:
+            for stage_workers in [int(s) for s in args.stage_workers.split(',')]:
+                settings = {
+                    'mode': args.mode, 'workers': workers, 'stage_workers': stage_workers,
+                    'image_share': args.image_share, 'doc_pages': args.doc_pages,
+                    'latency_scale': args.latency_scale, 'persist': args.persist,
+                    'shared_dir': shared_dir, 'seed': args.seed
+                }
+                print(f"{args.mode} mode, {workers} worker(s), {stage_workers} stage worker(s)")
+                saturation = None
+                for rate in rates:
+                    level = run_level(settings, rate, args.duration)
+                    print_level(level)
+                    if is_saturated(level, args):
+                        break
+                    saturation = rate
+                print(f"  sustainable rate: {saturation if saturation is not None else '< ' + str(rates[0])}/s\n")
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# reference_parser.py
+import re
+from typing import Dict, List, Optional, Tuple
+
+SECTION_HEADINGS = ('references', 'bibliography', 'works cited', 'literature cited')
+SECTION_ENDS = ('appendix', 'acknowledg')
+VALID_MARKERS = ('doi.org', 'http://', 'https://', 'isbn')
+
+# All anchored to the start of a line with no nested quantifiers, so each
+# match is linear in the length of the line
+ENTRY_START = re.compile(r'\[?\d+[.)\]]? |•|\d+\.\s|\[[A-Z]+\]')
+HEADING_NUMBER = re.compile(r'(?:\d+|[ivxlc]+)[.)]?\s+')
+YEAR = re.compile(r'\(\d{4}\)')
+
+
+def parse_references(text: str) -> List[Dict]:
+    """Split the reference section into entries and flag those with a DOI, URL, ISBN or year.
+
+    Runs in time linear in the input: lines are scanned once to find the
+    section, once to collect it, and every per-line check is anchored or a
+    plain substring search.
+    """
+    lines = text.splitlines()
+    start = _find_section(lines)
+    if start is None:
+        return []
+    index, rest = start
+
+    entries = [[rest]]
+    for line in lines[index + 1:]:
+        if line.lstrip().lower().startswith(SECTION_ENDS):
+            break
+        if ENTRY_START.match(line):
+            entries.append([line])
+        else:
+            entries[-1].append(line)
+
+    references = []
+    for entry in entries:
+        entry = '\n'.join(entry).strip()
+        if entry:
+            references.append({'reference': entry, 'valid': is_valid_reference(entry)})
+    return references
+
+
+def is_section_end(line: str) -> bool:
+    """True for a heading-only line such as "APPENDIX", "Appendix B:" or "Acknowledgements"."""
+    words = line.lower().rstrip(':. ').split()
+    return 0 < len(words) <= 2 and words[0].startswith(SECTION_ENDS)
+
+
+def is_valid_reference(entry: str) -> bool:
+    lowered = entry.lower()
+    return any(marker in lowered for marker in VALID_MARKERS) or bool(YEAR.search(entry))
+
+
+def _find_section(lines: List[str]) -> Optional[Tuple[int, str]]:
+    """Line index where the section starts and the text following its heading.
+
+    The last line that is only a heading ("References", "7. Bibliography:")
+    wins, which skips table-of-contents entries. Without one, fall back to
+    the first mention of a heading word anywhere in the text.
+    """
+    heading = None
+    first_mention = None
+    for i, line in enumerate(lines):
+        lowered = line.lower()
+        if first_mention is None:
+            positions = [(lowered.find(h), h) for h in SECTION_HEADINGS if h in lowered]
+            if positions:
+                pos, word = min(positions)
+                first_mention = (i, line[pos + len(word):])
+        stripped = lowered.strip()
+        number = HEADING_NUMBER.match(stripped)
+        if number:
+            stripped = stripped[number.end():]
+        if stripped.rstrip(':. ') in SECTION_HEADINGS:
+            heading = (i, '')
+    return heading or first_mention
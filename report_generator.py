@@ -23,16 +23,35 @@ class PDF(FPDF):
         self.set_font('DejaVu', '', 8)  # Use regular font for footer
         self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
 
+STAGE_NAMES = {
+    'references': "reference validation",
+    'direct_quotes': "direct quote search",
+    'paraphrased': "paraphrase check"
+}
+
 def safe_text(text):
     return unicodedata.normalize('NFKD', text).encode('latin-1', 'replace').decode('latin-1')
 
+def stages_with_status(analysis, status):
+    """Readable names of the analysis stages that ended with ``status``"""
+    stages = analysis.get('stages', {})
+    return [STAGE_NAMES.get(name, name) for name, timing in stages.items() if timing['status'] == status]
+
 def generate_plagiarism_report(text, analysis, filename):
     pdf = PDF()
     pdf.add_page()
     
     # Score Display 
+    truncated = stages_with_status(analysis, 'truncated')
+    failed = stages_with_status(analysis, 'failed')
+    label = 'Provisional' if truncated or failed else 'Final'
     pdf.set_font('DejaVu', '', 16)  # Use regular font (not bold)
-    pdf.cell(0, 10, f'Final Plagiarism Score: {analysis["plagiarism_score"]}%', 0, 1)
+    pdf.cell(0, 10, f'{label} Plagiarism Score: {analysis["plagiarism_score"]}%', 0, 1)
+    pdf.set_font('DejaVu', '', 10)
+    if truncated:
+        pdf.multi_cell(0, 8, f'Time budget reached before these checks finished: {", ".join(truncated)}')
+    if failed:
+        pdf.multi_cell(0, 8, f'These checks failed and their results are incomplete: {", ".join(failed)}')
     pdf.ln(10)
     
     # Document Preview Section
@@ -0,0 +1,56 @@
+# stage_executor.py
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+
+def timed(fn: Callable[[], object]) -> Tuple[object, float]:
+    """Call fn and return its result with the wall-clock seconds it took"""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+class StageExecutor:
+    def __init__(self, max_workers: int = 8):
+        """Run independent analysis stages concurrently under a shared deadline"""
+        self.max_workers = max_workers
+
+    def run(self, tasks: Dict[str, Callable[[], object]],
+            budget: Optional[float] = None) -> Iterator[Tuple[str, object, float, Optional[str]]]:
+        """Yield (name, result, seconds, error) for each task in completion order
+
+        ``seconds`` is the time the task itself ran, excluding queue wait.
+        A task that raises is yielded with a None result and the error
+        message. Tasks that have not finished when the budget (in seconds)
+        runs out are abandoned and never yielded, so callers can tell
+        truncated stages by the names they did not receive.
+        """
+        deadline = None if budget is None else time.monotonic() + budget
+        pool = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(tasks))))
+        try:
+            pending = {pool.submit(self._guarded, fn): name for name, fn in tasks.items()}
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    logging.warning(f"Stage deadline reached with {len(pending)} task(s) unfinished")
+                    break
+                for future in done:
+                    name = pending.pop(future)
+                    result, seconds, error = future.result()
+                    if error:
+                        logging.error(f"Stage {name} failed: {error}")
+                    yield name, result, seconds, error
+        finally:
+            # Running threads cannot be interrupted; they finish in the background
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _guarded(fn: Callable[[], object]) -> Tuple[object, float, Optional[str]]:
+        start = time.perf_counter()
+        try:
+            return fn(), time.perf_counter() - start, None
+        except Exception as e:
+            return None, time.perf_counter() - start, str(e) or type(e).__name__
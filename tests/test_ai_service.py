@@ -0,0 +1,55 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('cohere')
+pytest.importorskip('googleapiclient')
+pytest.importorskip('google.cloud.vision')
+
+from ai_service import AIService
+
+TEXT = 'Prior work shows "transformer models generalise well to unseen domains" in practice. ' * 40
+
+
+class RateLimitedClient:
+    def chat(self, **kwargs):
+        raise RuntimeError('429 rate limited')
+
+
+class SlowClient:
+    def chat(self, **kwargs):
+        time.sleep(1.0)
+        return SimpleNamespace(citations=[])
+
+
+def _service(client, monkeypatch):
+    ai = AIService(None, client=client, vision_service=SimpleNamespace())
+    monkeypatch.setattr(ai, '_google_search', lambda query: ['https://example.org'])
+    return ai
+
+
+def test_failing_backend_marks_the_stage_failed(monkeypatch):
+    analysis = _service(RateLimitedClient(), monkeypatch).analyze_content(TEXT)
+    paraphrased = analysis['stages']['paraphrased']
+
+    assert paraphrased['status'] == 'failed'
+    assert paraphrased['chunks_failed'] == paraphrased['chunks_total'] > 0
+    assert paraphrased['error'] == '429 rate limited'
+    assert analysis['stages']['direct_quotes']['status'] == 'complete'
+
+
+def test_deadline_truncates_unfinished_stages_but_not_references(monkeypatch):
+    analysis = _service(SlowClient(), monkeypatch).analyze_content(TEXT, deadline=0.2)
+
+    assert analysis['complete']
+    assert analysis['stages']['paraphrased']['status'] == 'truncated'
+    assert analysis['stages']['references']['status'] == 'complete'
+
+
+def test_failed_vision_call_still_has_visual_fields():
+    vision = SimpleNamespace(detect_text=lambda path: '', detect_visuals=lambda path: {})
+    analysis = AIService(None, client=SimpleNamespace(), vision_service=vision).analyze_image('image.png')
+
+    assert analysis['matching_images'] == [] and analysis['colors'] == []
+    assert analysis['stages']['vision_visuals']['status'] == 'complete'
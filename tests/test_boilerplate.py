@@ -0,0 +1,48 @@
+from boilerplate import PAGE_BREAK, BoilerplateFilter
+
+DECLARATION = ("I hereby declare that the work presented in this report is my own original work "
+               "and has not been submitted to any other university or institution")
+
+
+def _pages(count):
+    return PAGE_BREAK.join(
+        f"Department of Computer Science\nSection {page} discusses topic number {page * 7} in depth "
+        f"{'and more ' * page}\nPage {page}"
+        for page in range(1, count + 1)
+    )
+
+
+def test_repeated_headers_and_numbered_footers_are_stripped():
+    stripped, report = BoilerplateFilter().strip(_pages(5))
+
+    assert 'Department of Computer Science' not in stripped
+    assert 'Page 3' not in stripped
+    assert stripped.count('Section') == 5
+    assert stripped.count(PAGE_BREAK) == 4
+    assert report['lines_removed'] == 10
+
+
+def test_short_documents_skip_repeated_line_detection():
+    stripped, report = BoilerplateFilter().strip(_pages(2))
+
+    assert 'Department of Computer Science' in stripped
+    assert report['lines_removed'] == 0
+
+
+def test_template_lines_are_stripped_even_when_reworded_slightly():
+    text = f"DECLARATION\n{DECLARATION} for any award.\nOur method improves recall on three benchmarks."
+    stripped, report = BoilerplateFilter().strip(text)
+
+    assert stripped == "Our method improves recall on three benchmarks."
+    assert report == {'lines_removed': 2, 'chars_removed': len(text) - len(stripped)}
+
+
+def test_missing_template_store_only_strips_repeated_lines(tmp_path):
+    text = f"DECLARATION\n{DECLARATION}"
+
+    assert BoilerplateFilter(templates_path=str(tmp_path / 'missing.json')).strip(text)[0] == text
+
+
+def test_chunks_saved_counts_cohere_chunks():
+    assert BoilerplateFilter.chunks_saved('x' * 2500, 'x' * 900) == 2
+    assert BoilerplateFilter.chunks_saved('x' * 900, 'x' * 900) == 0
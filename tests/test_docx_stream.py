@@ -0,0 +1,45 @@
+import zipfile
+
+from docx_stream import iter_docx_text
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _paragraphs(*texts):
+    return ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in texts)
+
+
+def _write_docx(path, body, footer=None, header=None):
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document {W}><w:body>{body}</w:body></w:document>')
+        if header:
+            archive.writestr('word/header1.xml', f'<w:hdr {W}>{_paragraphs(header)}</w:hdr>')
+        if footer:
+            archive.writestr('word/footer1.xml', f'<w:ftr {W}>{_paragraphs(footer)}</w:ftr>')
+        archive.writestr('word/media/image1.png', b'\x89PNG' + b'\0' * 1024)
+
+
+def test_body_comes_last_so_footers_cannot_join_the_reference_list(tmp_path):
+    path = tmp_path / 'report.docx'
+    _write_docx(path, _paragraphs('Body', 'REFERENCES', '1. Smith, J. Unpublished lecture notes'),
+                footer='XYZ University (2024) https://xyz.edu', header='Running header')
+
+    assert list(iter_docx_text(str(path))) == [
+        'Running header',
+        'XYZ University (2024) https://xyz.edu',
+        'Body',
+        'REFERENCES',
+        '1. Smith, J. Unpublished lecture notes'
+    ]
+
+
+def test_table_cells_and_run_breaks_are_extracted(tmp_path):
+    path = tmp_path / 'table.docx'
+    body = (
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        '<w:r><w:t>Before</w:t><w:tab/><w:t>after</w:t></w:r></w:p>'
+        f'<w:tbl><w:tr><w:tc>{_paragraphs("A1")}</w:tc><w:tc>{_paragraphs("B1")}</w:tc></w:tr></w:tbl>'
+    )
+    _write_docx(path, body)
+
+    assert list(iter_docx_text(str(path))) == ['Before\tafter', 'A1', 'B1']
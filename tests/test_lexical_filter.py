@@ -0,0 +1,60 @@
+from lexical_filter import LexicalTriage, estimate_tokens, tokenize
+
+SOURCE = ("Convolutional networks learn hierarchical feature representations directly from raw pixels, "
+          "removing the need for handcrafted descriptors in image classification pipelines.")
+PROSE = "Our survey interviewed clinicians about scheduling habits across several rural hospitals."
+TABLE = "| 12 | 3.4 | 56 | 7.8 |\n| 90 | 1.2 | 34 | 5.6 |"
+
+HINDI = "मशीन लर्निंग मॉडल बड़े डेटा से सीखते हैं और नए उदाहरणों पर अच्छा प्रदर्शन करते हैं।"
+
+
+def test_non_latin_prose_is_tokenized_and_sent():
+    triage = LexicalTriage(corpus=[])
+
+    assert tokenize(HINDI)[:3] == ["मशीन", "लर्निंग", "मॉडल"]
+    assert triage.prose_share(HINDI) == 1.0
+    assert triage.select([HINDI * 5] * 3)['chunks_sent'] == 3
+
+
+def test_accented_latin_prose_counts_as_prose():
+    assert LexicalTriage.prose_share("Les modèles généralisent bien, selon l'étude.") == 1.0
+
+
+def test_tables_are_never_sent_even_without_a_budget():
+    report = LexicalTriage(corpus=[]).select([PROSE, TABLE, PROSE])
+
+    assert report['selected'] == [0, 2]
+    assert report['tokens_sent'] == 2 * estimate_tokens(PROSE)
+
+
+def test_budget_sends_corpus_matches_first_then_fills_by_prose():
+    triage = LexicalTriage(corpus=[SOURCE])
+    chunks = [PROSE, SOURCE, PROSE + " 1 2 3 4 5 6"]
+
+    report = triage.select(chunks, token_budget=estimate_tokens(SOURCE) + estimate_tokens(PROSE))
+
+    assert report['scores'][1] > 0.9 > report['scores'][0]
+    assert report['selected'] == [0, 1]
+    assert report['chunks_above_threshold'] == 1
+
+
+def test_chunks_without_a_corpus_match_still_use_leftover_budget():
+    report = LexicalTriage(corpus=[SOURCE]).select([PROSE, PROSE], token_budget=None)
+
+    assert report['chunks_sent'] == 2
+    assert report['chunks_above_threshold'] == 0
+
+
+def test_evaluate_reports_one_row_per_budget():
+    samples = [
+        {'document': 'a', 'text': SOURCE, 'suspicious': True},
+        {'document': 'a', 'text': PROSE, 'suspicious': False},
+        {'document': 'a', 'text': TABLE, 'suspicious': False}
+    ]
+    rows = LexicalTriage(corpus=[SOURCE]).evaluate(samples, [None, estimate_tokens(SOURCE), 0])
+
+    assert [(row['token_budget'], row['recall'], row['chunks_sent']) for row in rows] == [
+        (None, 1.0, 2),
+        (estimate_tokens(SOURCE), 1.0, 1),
+        (0, 0.0, 0)
+    ]
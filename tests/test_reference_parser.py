@@ -0,0 +1,56 @@
+from boilerplate import BoilerplateFilter
+from reference_parser import is_section_end, parse_references
+from text_normalizer import clean_text
+
+THESIS = (
+    "Introduction\n"
+    "As discussed in the references below, prior work is limited.\n"
+    "REFERENCES\n"
+    "1. LeCun, Y. (2015). Deep learning. Nature.\n"
+    "2. Smith, J. Some book\n"
+    "{end}\n"
+    "Survey data collected in March (2020) by the author.\n"
+)
+
+
+def _round_trip(text):
+    return parse_references(clean_text(text))
+
+
+def test_appendix_heading_survives_cleaning_and_ends_the_section():
+    references = _round_trip(THESIS.format(end="APPENDIX"))
+
+    assert [r['reference'] for r in references] == [
+        "1. LeCun, Y. (2015). Deep learning. Nature.",
+        "2. Smith, J. Some book"
+    ]
+    assert [r['valid'] for r in references] == [True, False]
+
+
+def test_acknowledgement_heading_survives_template_stripping():
+    stripped, _ = BoilerplateFilter().strip(THESIS.format(end="ACKNOWLEDGEMENT"))
+    references = _round_trip(stripped)
+
+    assert references[-1] == {'reference': "2. Smith, J. Some book", 'valid': False}
+
+
+def test_other_section_headers_are_still_dropped():
+    assert clean_text("DECLARATION:\nI  declare “this” is mine\nTable of Contents\n") == 'I declare "this" is mine'
+
+
+def test_heading_line_wins_over_earlier_mentions_and_toc_entries():
+    text = "Contents\nReferences ....... 45\nBody text\nReferences\n[1] A (2019) x\n[2] B none\n"
+
+    assert [r['reference'] for r in parse_references(text)] == ["[1] A (2019) x", "[2] B none"]
+
+
+def test_falls_back_to_first_mention_without_a_heading_line():
+    assert parse_references("see references [1] A (2019) x") == [{'reference': "[1] A (2019) x", 'valid': True}]
+
+
+def test_is_section_end():
+    assert is_section_end("APPENDIX")
+    assert is_section_end("Appendix B:")
+    assert is_section_end("Acknowledgements")
+    assert not is_section_end("Appendix B lists the survey questions")
+    assert not is_section_end("")
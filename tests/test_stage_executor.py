@@ -0,0 +1,58 @@
+import time
+
+from stage_executor import StageExecutor, timed
+
+
+def _sleep(seconds, result=None):
+    def task():
+        time.sleep(seconds)
+        return result
+    return task
+
+
+def _fail():
+    raise RuntimeError('429 rate limited')
+
+
+def test_results_arrive_in_completion_order_with_run_time():
+    results = list(StageExecutor(4).run({'slow': _sleep(0.2, 'b'), 'fast': _sleep(0.0, 'a')}))
+
+    assert [(name, result, error) for name, result, _, error in results] == [
+        ('fast', 'a', None),
+        ('slow', 'b', None)
+    ]
+    assert results[1][2] >= 0.2
+
+
+def test_seconds_exclude_queue_wait():
+    # One worker, so the second task waits for the first before it starts
+    results = dict((name, seconds) for name, _, seconds, _ in
+                   StageExecutor(1).run({'first': _sleep(0.2), 'second': _sleep(0.0)}))
+
+    assert results['second'] < 0.1
+
+
+def test_failing_task_is_yielded_with_its_error():
+    results = list(StageExecutor(2).run({'ok': _sleep(0.0, []), 'broken': _fail}))
+
+    assert ('broken', None, '429 rate limited') in [(name, result, error) for name, result, _, error in results]
+    assert ('ok', [], None) in [(name, result, error) for name, result, _, error in results]
+
+
+def test_unfinished_tasks_are_dropped_at_the_deadline():
+    start = time.perf_counter()
+    names = [name for name, _, _, _ in StageExecutor(2).run({'fast': _sleep(0.0), 'slow': _sleep(1.0)}, budget=0.2)]
+
+    assert names == ['fast']
+    assert time.perf_counter() - start < 0.8
+
+
+def test_zero_budget_yields_nothing_unfinished():
+    assert list(StageExecutor(1).run({'slow': _sleep(0.5)}, budget=0)) == []
+
+
+def test_timed_returns_result_and_seconds():
+    result, seconds = timed(_sleep(0.05, 'done'))
+
+    assert result == 'done'
+    assert seconds >= 0.05
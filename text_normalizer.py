@@ -0,0 +1,33 @@
+# text_normalizer.py
+from typing import Iterable, Iterator
+from reference_parser import is_section_end
+
+SECTION_HEADERS = ('declaration', 'certificate', 'acknowledgement', 'appendix', 'table of contents')
+QUOTE_TABLE = str.maketrans({'“': '"', '”': '"'})
+
+
+def clean_text(text: str) -> str:
+    return '\n'.join(normalize_lines(text.splitlines()))
+
+
+def normalize_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Single pass over a stream of lines: collapse whitespace, normalise
+    quotes and drop section header words, keeping one line per input line.
+
+    Blank lines are dropped. Heading-only lines that close a reference
+    section ("APPENDIX", "Acknowledgements") are kept, since the reference
+    parser stops at them.
+    """
+    for line in lines:
+        line = ' '.join(line.split()).translate(QUOTE_TABLE)
+        # Remove section headers but keep content
+        stripped = line.rstrip(': ')
+        lowered = stripped.lower()
+        for header in SECTION_HEADERS:
+            if lowered.endswith(header):
+                remainder = stripped[:len(stripped) - len(header)].rstrip()
+                if remainder or not is_section_end(line):
+                    line = remainder
+                break
+        if line:
+            yield line